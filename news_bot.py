@@ -4,13 +4,21 @@ News to X Post Generator Bot
 Fetches current news headlines and generates engaging X (Twitter) posts.
 """
 
+import asyncio
+import gzip
+import io
 import random
+from collections import defaultdict
 from datetime import datetime
-from typing import List, Dict
+from types import MappingProxyType
+from typing import List, Dict, Mapping, Sequence, Tuple
 import json
 import os
+import sys
+import time
+import urllib.error
 import urllib.request
-import xml.etree.ElementTree as ET
+import zlib
 from urllib.parse import urlparse
 
 try:
@@ -20,6 +28,39 @@ except ImportError:
     # dotenv is optional
     pass
 
+try:
+    from lxml import etree as ET
+    # Never resolve entities or touch the network while parsing feeds, keep
+    # libxml2's size limits, and salvage what it can from malformed markup
+    _PARSER_OPTIONS = {
+        'resolve_entities': False,
+        'no_network': True,
+        'huge_tree': False,
+        'recover': True,
+    }
+except ImportError:
+    # lxml is optional; fall back to the stdlib parser
+    import xml.etree.ElementTree as ET
+    _PARSER_OPTIONS = {}
+
+try:
+    import orjson
+except ImportError:
+    # orjson is optional; posts are serialized with the stdlib json module
+    orjson = None
+
+try:
+    import aiohttp
+except ImportError:
+    # aiohttp is optional; feeds are fetched with urllib in worker threads
+    aiohttp = None
+
+try:
+    import urllib3
+except ImportError:
+    # urllib3 is optional; without it each threaded fetch opens a new connection
+    urllib3 = None
+
 
 class NewsBot:
     """Bot that generates X posts from news headlines."""
@@ -34,6 +75,18 @@ class NewsBot:
         "https://www.engadget.com/rss.xml",  # Engadget
     ]
 
+    # Headers sent with every feed request
+    REQUEST_HEADERS = {'User-Agent': 'Mozilla/5.0 (NewsBot/1.0)'}
+
+    # Conditional-GET validators and last parsed headlines per feed
+    FEED_CACHE_FILE = "feed_cache.json"
+
+    # Seconds a fetched feed is reused in memory before it is requested again
+    FETCH_TTL_S = 300
+
+    # Minimum seconds between two requests to the same host
+    HOST_MIN_INTERVAL_S = 0.5
+
     # Post templates for variety
     POST_TEMPLATES = [
         "🔥 Breaking: {headline}",
@@ -47,7 +100,8 @@ class NewsBot:
     ]
 
     # Demo headlines for testing when network is unavailable
-    DEMO_HEADLINES = [
+    # (read-only, so they can be handed out without copying)
+    DEMO_HEADLINES = tuple(MappingProxyType(headline) for headline in [
         {
             'title': 'Scientists Discover New Method to Convert CO2 into Renewable Fuel',
             'link': 'https://example.com/climate-breakthrough',
@@ -96,7 +150,7 @@ class NewsBot:
             'source': 'Security News',
             'published': 'Today'
         },
-    ]
+    ])
 
     def __init__(self, max_posts: int = 5, demo_mode: bool = False):
         """
@@ -109,67 +163,325 @@ class NewsBot:
         self.max_posts = max_posts
         self.max_length = 280  # X character limit
         self.demo_mode = demo_mode
+        self._cache = self._load_cache()
+        self._fetch_cache: Dict[str, Tuple[float, List[Dict[str, str]]]] = {}
+        self._host_next_ok: Dict[str, float] = {}
+        self._host_semaphores = None
+        self._timestamp_second = None
+        self._timestamp_text = ''
+
+        # Keep-alive connection pool for the threaded fetch path
+        if urllib3 is not None and aiohttp is None:
+            # Follow redirects like urllib, but never retry failed requests so
+            # a slow feed is bounded by the 10s timeout
+            self._http = urllib3.PoolManager(
+                num_pools=8,
+                maxsize=16,
+                retries=urllib3.Retry(connect=0, read=0, other=0, status=0, redirect=5)
+            )
+        else:
+            self._http = None
+
+        # Text around the headline in each template, plus its combined length
+        self._template_parts = []
+        for template in self.POST_TEMPLATES:
+            prefix, _, suffix = template.partition('{headline}')
+            self._template_parts.append((prefix, suffix, len(prefix) + len(suffix)))
 
-    def fetch_headlines(self) -> List[Dict[str, str]]:
+    def _load_cache(self) -> Dict[str, Dict]:
+        """
+        Load cached feed validators and headlines from disk.
+
+        Returns:
+            Mapping of feed URL to its cache entry
+        """
+        try:
+            with open(self.FEED_CACHE_FILE) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_cache(self):
+        """Persist cached feed validators and headlines to disk."""
+        try:
+            with open(self.FEED_CACHE_FILE, 'w') as f:
+                json.dump(self._cache, f)
+        except OSError as e:
+            print(f"✗ Could not save feed cache: {e}")
+
+    def fetch_headlines(self) -> Sequence[Mapping[str, str]]:
         """
         Fetch headlines from various news sources using RSS feeds.
 
         Returns:
-            List of dictionaries containing headline info
+            Sequence of mappings containing headline info
         """
         # Use demo mode if enabled
         if self.demo_mode:
             print("Using demo headlines (demo mode enabled)")
-            return self.DEMO_HEADLINES.copy()
-
-        headlines = []
+            return self.DEMO_HEADLINES
 
         print("Fetching news headlines...")
-        for feed_url in self.NEWS_FEEDS:
-            try:
-                # Fetch RSS feed
-                req = urllib.request.Request(
-                    feed_url,
-                    headers={'User-Agent': 'Mozilla/5.0 (NewsBot/1.0)'}
+        headlines = asyncio.run(self._fetch_headlines_async())
+        self._save_cache()
+
+        # Fallback to demo mode if no headlines were fetched
+        if not headlines:
+            print("\n⚠ No headlines fetched from RSS feeds")
+            print("Falling back to demo mode...")
+            return self.DEMO_HEADLINES
+
+        return headlines
+
+    async def _fetch_headlines_async(self) -> List[Dict[str, str]]:
+        """
+        Fetch all RSS feeds concurrently.
+
+        Uses a pooled aiohttp session when aiohttp is installed, otherwise
+        runs urllib requests in worker threads.
+
+        Returns:
+            List of dictionaries containing headline info
+        """
+        # Semaphores belong to the running event loop, so create them per run
+        self._host_semaphores = defaultdict(lambda: asyncio.Semaphore(1))
+
+        if aiohttp is None:
+            results = await asyncio.gather(
+                *(self._fetch_one(None, url) for url in self.NEWS_FEEDS)
+            )
+        else:
+            connector = aiohttp.TCPConnector(limit=32, ttl_dns_cache=300)
+            async with aiohttp.ClientSession(
+                connector=connector, headers=self.REQUEST_HEADERS
+            ) as session:
+                results = await asyncio.gather(
+                    *(self._fetch_one(session, url) for url in self.NEWS_FEEDS)
                 )
 
-                with urllib.request.urlopen(req, timeout=10) as response:
-                    xml_content = response.read()
+        headlines = []
+        for items in results:
+            headlines.extend(items)
 
-                # Parse XML
-                root = ET.fromstring(xml_content)
+        return headlines
 
-                # Get source name
-                source_elem = root.find('.//channel/title')
-                source = source_elem.text if source_elem is not None else 'News Source'
+    async def _fetch_one(self, session, feed_url: str) -> List[Dict[str, str]]:
+        """
+        Fetch and parse a single RSS feed.
 
-                # Extract items (headlines)
-                for item in root.findall('.//item')[:5]:  # Top 5 from each source
-                    title_elem = item.find('title')
-                    link_elem = item.find('link')
-                    pub_elem = item.find('pubDate')
+        Sends the feed's cached ETag / Last-Modified validators so an
+        unchanged feed answers 304 and its cached headlines are reused.
 
-                    if title_elem is not None and link_elem is not None:
-                        headlines.append({
-                            'title': title_elem.text,
-                            'link': link_elem.text,
-                            'source': source,
-                            'published': pub_elem.text if pub_elem is not None else 'Unknown'
-                        })
+        Args:
+            session: aiohttp session, or None to fetch with urllib
+            feed_url: URL of the RSS feed
 
-                print(f"✓ Fetched from {source}")
-            except Exception as e:
-                print(f"✗ Error fetching from {feed_url}: {e}")
+        Returns:
+            List of headline dictionaries, or an empty list on error
+        """
+        # Reuse headlines fetched within the last FETCH_TTL_S seconds
+        hit = self._fetch_cache.get(feed_url)
+        if hit and time.monotonic() - hit[0] < self.FETCH_TTL_S:
+            return hit[1]
+
+        cached = self._cache.get(feed_url)
+        headers = {}
+        if cached:
+            if cached.get('etag'):
+                headers['If-None-Match'] = cached['etag']
+            if cached.get('last_modified'):
+                headers['If-Modified-Since'] = cached['last_modified']
+
+        try:
+            status, response_headers, xml_content = await self._request(
+                session, feed_url, headers
+            )
+
+            if status == 304 and cached:
+                headlines = cached['items']
+                print(f"✓ {cached['source']} not modified, using cached headlines")
+            else:
+                source, headlines = self._parse_feed(xml_content)
+
+                etag = response_headers.get('ETag')
+                last_modified = response_headers.get('Last-Modified')
+                if etag or last_modified:
+                    self._cache[feed_url] = {
+                        'etag': etag,
+                        'last_modified': last_modified,
+                        'source': source,
+                        'items': headlines
+                    }
 
-        # Fallback to demo mode if no headlines were fetched
-        if not headlines:
-            print("\n⚠ No headlines fetched from RSS feeds")
-            print("Falling back to demo mode...")
-            return self.DEMO_HEADLINES.copy()
+                print(f"✓ Fetched from {source}")
+        except Exception as e:
+            print(f"✗ Error fetching from {feed_url}: {e}")
+            return []
 
+        self._fetch_cache[feed_url] = (time.monotonic(), headlines)
         return headlines
 
-    def generate_post(self, headline: Dict[str, str]) -> str:
+    async def _request(self, session, feed_url: str, headers: Dict[str, str]):
+        """
+        Download a feed, one request at a time per host.
+
+        Requests to the same host are serialized and spaced at least
+        HOST_MIN_INTERVAL_S apart so parallel fetches do not trip rate limits.
+
+        Args:
+            session: aiohttp session, or None to fetch in a worker thread
+            feed_url: URL of the RSS feed
+            headers: Extra request headers
+
+        Returns:
+            Tuple of (status code, response headers, raw response body)
+        """
+        host = urlparse(feed_url).netloc
+
+        async with self._host_semaphores[host]:
+            delay = self._host_next_ok.get(host, 0) - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            try:
+                if session is None:
+                    loop = asyncio.get_running_loop()
+                    return await loop.run_in_executor(
+                        None, self._download, feed_url, headers
+                    )
+                return await self._download_async(session, feed_url, headers)
+            finally:
+                self._host_next_ok[host] = time.monotonic() + self.HOST_MIN_INTERVAL_S
+
+    async def _download_async(self, session, feed_url: str, headers: Dict[str, str]):
+        """
+        Download a feed with aiohttp.
+
+        Args:
+            session: aiohttp session
+            feed_url: URL of the RSS feed
+            headers: Extra request headers
+
+        Returns:
+            Tuple of (status code, response headers, raw response body)
+        """
+        async with session.get(
+            feed_url, headers=headers, timeout=aiohttp.ClientTimeout(total=10)
+        ) as response:
+            response.raise_for_status()
+            return response.status, response.headers, await response.read()
+
+    def _download(self, feed_url: str, headers: Dict[str, str]):
+        """
+        Download a feed synchronously (used when aiohttp is not installed).
+
+        Uses the pooled urllib3 manager when urllib3 is installed, otherwise
+        urllib. Requests a compressed response; urllib3 decodes it itself,
+        while the urllib body is decompressed here.
+
+        Args:
+            feed_url: URL of the RSS feed
+            headers: Extra request headers
+
+        Returns:
+            Tuple of (status code, response headers, raw response body)
+        """
+        headers = {
+            **self.REQUEST_HEADERS,
+            'Accept-Encoding': 'gzip, deflate',
+            **headers
+        }
+
+        if self._http is not None:
+            response = self._http.request('GET', feed_url, headers=headers, timeout=10)
+            if response.status >= 400:
+                raise urllib3.exceptions.HTTPError(
+                    f"HTTP Error {response.status}: {response.reason}"
+                )
+            return response.status, response.headers, response.data
+
+        req = urllib.request.Request(feed_url, headers=headers)
+
+        try:
+            with urllib.request.urlopen(req, timeout=10) as response:
+                body = response.read()
+                encoding = response.headers.get('Content-Encoding', '').lower()
+                if encoding == 'gzip':
+                    body = gzip.decompress(body)
+                elif encoding == 'deflate':
+                    try:
+                        body = zlib.decompress(body)
+                    except zlib.error:
+                        # Some servers send raw deflate without the zlib header
+                        body = zlib.decompress(body, -zlib.MAX_WBITS)
+                return response.status, response.headers, body
+        except urllib.error.HTTPError as e:
+            # urllib reports 304 Not Modified as an error
+            if e.code == 304:
+                return e.code, e.headers, b''
+            raise
+
+    def _parse_feed(self, xml_content: bytes) -> Tuple[str, List[Dict[str, str]]]:
+        """
+        Parse an RSS document into headlines.
+
+        Args:
+            xml_content: Raw RSS XML
+
+        Returns:
+            Tuple of (source name, list of headline dictionaries)
+        """
+        source = 'News Source'
+        source_found = False
+        headlines = []
+        append = headlines.append
+        kept = 0
+        depth = 0
+        channel_depth = None
+
+        # Stream through the document instead of building the whole tree
+        for event, elem in ET.iterparse(
+            io.BytesIO(xml_content), events=('start', 'end'), **_PARSER_OPTIONS
+        ):
+            if event == 'start':
+                depth += 1
+                if elem.tag == 'channel' and channel_depth is None:
+                    channel_depth = depth
+                continue
+
+            depth -= 1
+            if elem.tag == 'title' and depth == channel_depth and not source_found:
+                # Get source name from the channel's own <title> as it closes
+                source = elem.text
+                source_found = True
+                elem.clear()
+            elif elem.tag == 'item':
+                find = elem.find
+                title_elem = find('title')
+                link_elem = find('link')
+                pub_elem = find('pubDate')
+
+                # Skip items missing a title or link, or with empty ones
+                if (title_elem is not None and title_elem.text
+                        and link_elem is not None and link_elem.text):
+                    append({
+                        'title': title_elem.text,
+                        'link': link_elem.text,
+                        'source': source,
+                        'published': pub_elem.text if pub_elem is not None else 'Unknown'
+                    })
+                    kept += 1
+
+                # Release the item's children once extracted
+                elem.clear()
+
+                # Stop reading once the top 5 from this source are kept
+                if kept >= 5:
+                    break
+
+        return source, headlines
+
+    def generate_post(self, headline: Mapping[str, str]) -> str:
         """
         Generate an X post from a headline.
 
@@ -180,25 +492,26 @@ class NewsBot:
             Formatted X post text
         """
         # Choose a random template
-        template = random.choice(self.POST_TEMPLATES)
+        prefix, suffix, overhead = random.choice(self._template_parts)
 
         # Get the headline title
         title = headline['title']
         link = headline['link']
 
-        # Start with template
-        post = template.format(headline=title)
+        # Room left for the title once the template and link are added
+        budget = self.max_length - overhead - len(link) - 2
 
         # Add link if there's space
-        if len(post) + len(link) + 2 <= self.max_length:
-            post = f"{post}\n{link}"
+        if len(title) <= budget:
+            post = f"{prefix}{title}{suffix}\n{link}"
         else:
             # Truncate title to make room for link
-            available_space = self.max_length - len(template.format(headline="")) - len(link) - 5
+            available_space = budget - 3
             if available_space > 50:
                 truncated_title = title[:available_space] + "..."
-                post = template.format(headline=truncated_title)
-                post = f"{post}\n{link}"
+                post = f"{prefix}{truncated_title}{suffix}\n{link}"
+            else:
+                post = f"{prefix}{title}{suffix}"
 
         return post
 
@@ -215,33 +528,59 @@ class NewsBot:
             print("No headlines found!")
             return []
 
-        # Shuffle to get variety
-        random.shuffle(headlines)
+        # Pick a random selection of headlines for variety
+        selected = random.sample(headlines, min(self.max_posts, len(headlines)))
 
         # Generate posts
         posts = []
-        for headline in headlines[:self.max_posts]:
+        for headline in selected:
             post = self.generate_post(headline)
             posts.append(post)
 
         return posts
 
-    def save_posts(self, posts: List[str], filename: str = "posts.json"):
+    def _timestamp(self) -> str:
+        """
+        Get the current local time as an ISO 8601 string.
+
+        The string is only rebuilt when the second changes.
+
+        Returns:
+            Timestamp with seconds precision
+        """
+        second = int(time.time())
+        if second != self._timestamp_second:
+            self._timestamp_second = second
+            self._timestamp_text = datetime.fromtimestamp(second).isoformat(timespec='seconds')
+        return self._timestamp_text
+
+    def save_posts(self, posts: List[str], filename: str = "posts.json", pretty: bool = False):
         """
         Save generated posts to a JSON file.
 
         Args:
             posts: List of post texts
             filename: Output filename
+            pretty: Indent the JSON instead of writing it compactly
         """
         output = {
-            'generated_at': datetime.now().isoformat(),
+            'generated_at': self._timestamp(),
             'count': len(posts),
             'posts': posts
         }
 
-        with open(filename, 'w') as f:
-            json.dump(output, f, indent=2)
+        if orjson is not None:
+            data = orjson.dumps(output, option=orjson.OPT_INDENT_2 if pretty else 0)
+        else:
+            data = json.dumps(
+                output,
+                indent=2 if pretty else None,
+                separators=None if pretty else (',', ':'),
+                ensure_ascii=False
+            ).encode('utf-8')
+
+        with open(filename, 'wb') as f:
+            f.write(data)
 
         print(f"\n✓ Saved {len(posts)} posts to {filename}")
 
@@ -252,16 +591,21 @@ class NewsBot:
         Args:
             posts: List of post texts
         """
-        print(f"\n{'='*60}")
-        print(f"Generated {len(posts)} X Posts")
-        print(f"{'='*60}\n")
+        lines = [
+            f"\n{'='*60}",
+            f"Generated {len(posts)} X Posts",
+            f"{'='*60}\n",
+        ]
 
         for i, post in enumerate(posts, 1):
-            print(f"Post #{i}:")
-            print(f"{'-'*60}")
-            print(post)
-            print(f"{'-'*60}")
-            print(f"Characters: {len(post)}/280\n")
+            lines.append(f"Post #{i}:")
+            lines.append(f"{'-'*60}")
+            lines.append(post)
+            lines.append(f"{'-'*60}")
+            lines.append(f"Characters: {len(post)}/280\n")
+
+        # Write the whole report at once rather than one print per line
+        sys.stdout.write('\n'.join(lines) + '\n')
 
 
 def main():
@@ -273,6 +617,14 @@ def main():
     num_posts = int(os.getenv('NUM_POSTS', '5'))
     demo_mode = os.getenv('DEMO_MODE', 'false').lower() == 'true'
 
+    # Use an io_uring event loop when available (Linux 5.11+)
+    try:
+        import uringcore
+        asyncio.set_event_loop_policy(uringcore.EventLoopPolicy())
+    except ImportError:
+        # uringcore is optional; fall back to the default asyncio loop
+        pass
+
     # Create bot instance
     bot = NewsBot(max_posts=num_posts, demo_mode=demo_mode)
 